@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark streamed input decompression against decompressing to disk and
+then parsing. Writes the same lap CSV as BGZF gzip and seekable zstd, then
+times pd.read_csv on each one read through the baseline pandas path, a
+decompress-then-parse copy, and stream_input.open_input with one and with
+several decompression threads.
+
+Usage:
+    PYTHONPATH=f1_model bin/benchmark_stream_input.py [rows] [workers]
+"""
+import gzip
+import os
+import struct
+import sys
+import tempfile
+import time
+import zlib
+import pandas as pd
+import zstandard
+import stream_input
+
+BLOCK_SIZE = 65280
+
+
+def bgzf_member(data: bytes) -> bytes:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+    deflated = compressor.compress(data) + compressor.flush()
+    block_size = 12 + 6 + len(deflated) + 8
+    header = (b'\x1f\x8b\x08\x04' + b'\x00' * 4 + b'\x00\xff'
+              + struct.pack('<H', 6) + b'BC'
+              + struct.pack('<HH', 2, block_size - 1))
+    trailer = struct.pack('<II', zlib.crc32(data), len(data) & 0xffffffff)
+    return header + deflated + trailer
+
+
+def write_bgzf(data: bytes, path: str) -> None:
+    with open(path, 'wb') as handle:
+        for start in range(0, len(data), BLOCK_SIZE):
+            handle.write(bgzf_member(data[start:start + BLOCK_SIZE]))
+        handle.write(bgzf_member(b''))
+
+
+def write_seekable_zstd(data: bytes, path: str) -> None:
+    compressor = zstandard.ZstdCompressor(level=3)
+    frames = [compressor.compress(data[start:start + BLOCK_SIZE])
+              for start in range(0, len(data), BLOCK_SIZE)]
+    entries = b''.join(struct.pack('<II', len(frame), BLOCK_SIZE)
+                       for frame in frames)
+    footer = struct.pack('<IBI', len(frames), 0,
+                         stream_input.ZSTD_SEEKABLE_MAGIC)
+    with open(path, 'wb') as handle:
+        handle.write(b''.join(frames))
+        handle.write(struct.pack('<II', stream_input.ZSTD_SKIPPABLE_MAGIC,
+                                 len(entries) + len(footer)))
+        handle.write(entries + footer)
+
+
+def decompress_then_parse(path: str, compression: str,
+                          directory: str) -> pd.DataFrame:
+    copy_path = os.path.join(directory, 'decompressed.csv')
+    with open(path, 'rb') as source, open(copy_path, 'wb') as target:
+        if compression == 'gzip':
+            reader = gzip.GzipFile(fileobj=source)
+        else:
+            reader = (zstandard.ZstdDecompressor()
+                      .stream_reader(source, read_across_frames=True))
+        with reader:
+            while True:
+                block = reader.read(stream_input.CHUNK_SIZE)
+                if not block:
+                    break
+                target.write(block)
+    data = pd.read_csv(copy_path)
+    os.remove(copy_path)
+    return data
+
+
+def streamed(path: str, workers: int) -> pd.DataFrame:
+    with stream_input.open_input(path, workers=workers) as (source, _):
+        return pd.read_csv(source)
+
+
+def best_of(function, repeats: int = 3) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(rows: int, workers: int) -> None:
+    drivers = [f"Driver {number}" for number in range(20)]
+    lines = [f"{drivers[lap % 20]},{1 + lap % 3}:{lap % 60:02}."
+             f"{lap % 1000:03}" for lap in range(rows)]
+    data = ("driver,time\n" + "\n".join(lines) + "\n").encode()
+
+    with tempfile.TemporaryDirectory() as directory:
+        inputs = {'gzip': os.path.join(directory, 'laps.csv.gz'),
+                  'zstd': os.path.join(directory, 'laps.csv.zst')}
+        write_bgzf(data, inputs['gzip'])
+        write_seekable_zstd(data, inputs['zstd'])
+
+        print(f"{rows} rows, {len(data) / 1e6:.1f} MB uncompressed, "
+              f"best of 3 runs in seconds")
+        for compression, path in inputs.items():
+            results = {
+                'pandas read_csv(path)': best_of(
+                    lambda: pd.read_csv(path)),
+                'decompress then parse': best_of(
+                    lambda: decompress_then_parse(path, compression,
+                                                  directory)),
+                'streamed, 1 worker': best_of(
+                    lambda: streamed(path, 1)),
+                f'streamed, {workers} workers': best_of(
+                    lambda: streamed(path, workers))
+            }
+            for name, seconds in results.items():
+                print(f"{compression:5} {name:24} {seconds:6.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3000000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1)
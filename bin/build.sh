@@ -28,6 +28,8 @@ export PYTHONPATH=$PWD/f1_model
 coverage run --source f1_model --omit */setup.py -m pytest
 coverage report -m
 
-echo "Removing PyTest sample CSV file from data directory"
+echo "Removing PyTest sample output files from data directory"
 rm -rf $PWD/data/top_3_drivers.csv
+rm -rf $PWD/data/top_3_drivers_profile.json
+rm -rf $PWD/data/leaderboard.*
 echo "Build complete"
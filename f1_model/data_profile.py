@@ -0,0 +1,218 @@
+import json
+import numpy as np
+import pandas as pd
+from collections import Counter
+from datetime import timedelta
+import f1_functions
+import output_writer
+
+
+class ProfileAccumulator:
+    """
+    Mergeable accumulator of input data statistics. Each call to update
+    profiles one chunk of inputs with vectorized operations, and accumulators
+    built over separate chunks can be combined with merge, so chunked or
+    parallel runs produce the same profile as a single pass.
+
+    Inputs are profiled as read from the CSV, before time_conversion, so
+    that blank and unparseable lap times are reported rather than failing
+    the run. Duplicate rows are counted exactly by keeping one 64-bit hash
+    per distinct row, so that part of the state costs O(distinct rows);
+    every other statistic is of fixed size or bounded by the number of
+    drivers and histogram bins.
+
+    Args:
+        time_column (str): Name of the lap time column.
+
+        driver_column (str): Name of the driver column.
+
+        bin_width (timedelta): Width of the lap time histogram bins.
+    """
+    def __init__(self,
+                 time_column: str = 'time',
+                 driver_column: str = 'driver',
+                 bin_width: timedelta = timedelta(seconds=5)) -> None:
+        self.time_column = time_column
+        self.driver_column = driver_column
+        self.bin_width = pd.Timedelta(bin_width).value
+        self.rows = 0
+        self.nulls = Counter()
+        self.blanks = Counter()
+        self.invalid_times = 0
+        self.rows_per_driver = Counter()
+        self.row_hashes = np.array([], dtype=np.uint64)
+        self._pending_hashes = []
+        self._pending_size = 0
+        self.lap_count = 0
+        self.lap_total = 0
+        self.lap_min = None
+        self.lap_max = None
+        self.histogram = Counter()
+
+    def update(self,
+               data: pd.DataFrame,
+               lap_times: pd.Series = None) -> 'ProfileAccumulator':
+        """
+        Add the statistics of a chunk of inputs to the profile.
+
+        Args:
+            data (pd.DataFrame): A dataframe containing data for drivers and
+                                 lap times as strings, before time
+                                 conversion.
+
+            lap_times (pd.Series): Optional lap times already parsed from
+                                   the time column with
+                                   f1_functions.parse_lap_times, so that the
+                                   column is not parsed twice.
+
+        Returns:
+            ProfileAccumulator: The updated accumulator.
+        """
+        self.rows += len(data)
+
+        for column in data.columns:
+            values = data[column]
+            self.nulls[column] += int(values.isna().sum())
+            if (values.dtype == object
+                    or pd.api.types.is_string_dtype(values)):
+                blanks = values.str.strip().eq('').fillna(False)
+                self.blanks[column] += int(blanks.sum())
+
+        self.rows_per_driver.update(
+            data[self.driver_column].value_counts().to_dict())
+
+        row_hashes = pd.util.hash_pandas_object(data.astype('string'),
+                                                index=False)
+        self._add_hashes(np.unique(row_hashes.to_numpy()))
+
+        raw_times = data[self.time_column]
+        if lap_times is None:
+            lap_times = f1_functions.parse_lap_times(raw_times)
+        self.invalid_times += int((raw_times.notna()
+                                   & raw_times.astype('string').str.strip()
+                                   .ne('')
+                                   & lap_times.isna()).sum())
+
+        lap_times = (lap_times.dropna()
+                     .to_numpy(dtype='timedelta64[ns]')
+                     .astype('int64'))
+        if len(lap_times):
+            self.lap_count += len(lap_times)
+            self.lap_total += int(lap_times.sum())
+            self._update_bounds(int(lap_times.min()), int(lap_times.max()))
+            bins, counts = np.unique(lap_times // self.bin_width,
+                                     return_counts=True)
+            self.histogram.update(dict(zip(bins.tolist(), counts.tolist())))
+
+        return self
+
+    def merge(self, other: 'ProfileAccumulator') -> 'ProfileAccumulator':
+        """
+        Combine the statistics of another accumulator into this one.
+
+        Args:
+            other (ProfileAccumulator): An accumulator built with the same
+                                        columns and bin width.
+
+        Returns:
+            ProfileAccumulator: The merged accumulator.
+        """
+        if other.bin_width != self.bin_width:
+            raise ValueError("Cannot merge profiles with different "
+                             "histogram bin widths")
+
+        self.rows += other.rows
+        self.nulls.update(other.nulls)
+        self.blanks.update(other.blanks)
+        self.invalid_times += other.invalid_times
+        self.rows_per_driver.update(other.rows_per_driver)
+        other._compact_hashes()
+        self._add_hashes(other.row_hashes)
+        self.lap_count += other.lap_count
+        self.lap_total += other.lap_total
+        if other.lap_count:
+            self._update_bounds(other.lap_min, other.lap_max)
+        self.histogram.update(other.histogram)
+
+        return self
+
+    def _add_hashes(self, row_hashes: np.ndarray) -> None:
+        # Chunks are deduplicated against the accumulated hashes only once
+        # the pending hashes outgrow them, so each hash is re-sorted an
+        # amortised constant number of times.
+        self._pending_hashes.append(row_hashes)
+        self._pending_size += len(row_hashes)
+        if self._pending_size > len(self.row_hashes):
+            self._compact_hashes()
+
+    def _compact_hashes(self) -> None:
+        if self._pending_hashes:
+            self.row_hashes = np.unique(
+                np.concatenate([self.row_hashes] + self._pending_hashes))
+            self._pending_hashes = []
+            self._pending_size = 0
+
+    def _update_bounds(self, lap_min: int, lap_max: int) -> None:
+        self.lap_min = (lap_min if self.lap_min is None
+                        else min(self.lap_min, lap_min))
+        self.lap_max = (lap_max if self.lap_max is None
+                        else max(self.lap_max, lap_max))
+
+    def to_dict(self) -> dict:
+        """
+        Summarise the accumulated statistics.
+
+        Returns:
+            dict: A JSON serialisable profile of the inputs.
+        """
+        self._compact_hashes()
+
+        def rate(count: int) -> float:
+            return round(count / self.rows, 6) if self.rows else 0.0
+
+        def lap_time(nanoseconds: int) -> str:
+            return f1_functions.format_timedelta(pd.Timedelta(nanoseconds))
+
+        columns = {
+            column: {'nulls': self.nulls[column],
+                     'null_rate': rate(self.nulls[column]),
+                     'blanks': self.blanks[column],
+                     'blank_rate': rate(self.blanks[column])}
+            for column in self.nulls
+        }
+        if self.time_column in columns:
+            columns[self.time_column]['invalid'] = self.invalid_times
+
+        lap_times = {'count': self.lap_count}
+        if self.lap_count:
+            lap_times.update({
+                'min': lap_time(self.lap_min),
+                'max': lap_time(self.lap_max),
+                'mean': lap_time(self.lap_total // self.lap_count),
+                'bin_width_seconds': self.bin_width / 1e9,
+                'histogram': {lap_time(start * self.bin_width): count
+                              for start, count
+                              in sorted(self.histogram.items())}
+            })
+
+        return {
+            'rows': self.rows,
+            'duplicate_rows': self.rows - len(self.row_hashes),
+            'columns': columns,
+            'rows_per_driver': dict(sorted(self.rows_per_driver.items())),
+            'lap_times': lap_times
+        }
+
+
+def write_profile(profile: ProfileAccumulator, output_path: str) -> None:
+    """
+    Write a profile to a JSON file, atomically replacing the output path.
+
+    Args:
+        profile (ProfileAccumulator): The accumulated input profile.
+
+        output_path (str): Path of the JSON file to write.
+    """
+    with output_writer.atomic_output(output_path) as temp_path:
+        with open(temp_path, 'w') as handle:
+            json.dump(profile.to_dict(), handle, indent=2)
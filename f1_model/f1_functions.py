@@ -1,9 +1,25 @@
+import numpy as np
 import pandas as pd
 from datetime import timedelta
 
 
+def parse_lap_times(times: pd.Series) -> pd.Series:
+    """
+    Parse MM:SS.SSS lap time strings to timedelta. Values that cannot be
+    parsed, including blanks, become NaT.
+
+    Args:
+        times (pd.Series): A series of lap time strings.
+
+    Returns:
+        pd.Series: The parsed lap times.
+    """
+    return pd.to_timedelta('00:' + times.astype('string'), errors='coerce')
+
+
 def time_conversion(data: pd.DataFrame,
-                    column_to_convert: str) -> pd.DataFrame:
+                    column_to_convert: str,
+                    lap_times: pd.Series = None) -> pd.DataFrame:
     """
     Convert string columns in a dataframe to timedelta.
 
@@ -13,11 +29,26 @@ def time_conversion(data: pd.DataFrame,
 
         column_to_convert (str): Name of the string column to convert.
 
+        lap_times (pd.Series): Optional lap times already parsed from the
+                               column with parse_lap_times, so that the
+                               column is not parsed twice.
+
     Returns:
         pd.DataFrame: The dataframe with the converted column.
+
+    Raises:
+        ValueError: If a non-null value cannot be parsed as a lap time.
     """
-    data[column_to_convert] = '00:' + data[column_to_convert]
-    data[column_to_convert] = pd.to_timedelta(data[column_to_convert])
+    if lap_times is None:
+        lap_times = parse_lap_times(data[column_to_convert])
+
+    invalid = data[column_to_convert].notna() & lap_times.isna()
+    if invalid.any():
+        examples = data.loc[invalid, column_to_convert].head().tolist()
+        raise ValueError(f"Invalid lap times in {column_to_convert}: "
+                         f"{examples}")
+
+    data[column_to_convert] = lap_times
 
     return data
 
@@ -59,6 +90,45 @@ def best_lap_per_driver(data: pd.DataFrame) -> pd.DataFrame:
     return best_lap_data
 
 
+def laps_per_driver(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Count the number of laps recorded for each driver in the dataset.
+
+    Args:
+        data (pd.DataFrame): A dataframe containing data for drivers and lap
+                             times.
+
+    Returns:
+        pd.DataFrame: A dataframe with the number of laps for each driver.
+    """
+    laps_data = (data.groupby('driver')['time']
+                 .count()
+                 .reset_index(name='laps'))
+
+    return laps_data
+
+
+def rank_drivers_by_average_time(f1_drivers: pd.DataFrame) -> pd.DataFrame:
+    """
+    Sort all drivers by average lap time in ascending order and number their
+    positions, starting at 1.
+
+    Args:
+        f1_drivers (pd.DataFrame): A dataframe containing data for drivers
+                                   and average/fastest lap times.
+
+    Returns:
+        pd.DataFrame: A dataframe with every driver ranked by average lap
+                      time.
+    """
+    ranked_drivers = (
+        f1_drivers
+        .sort_values(by=['average_lap_time', 'fastest_lap_time'])
+        .reset_index(drop=True))
+    ranked_drivers.insert(0, 'rank', range(1, len(ranked_drivers) + 1))
+    return ranked_drivers
+
+
 def top_3_drivers_by_average_time(f1_drivers: pd.DataFrame) -> pd.DataFrame:
     """
     Sort drivers by average lap time and return the top 3 drivers in ascending
@@ -95,3 +165,46 @@ def format_timedelta(delta: timedelta) -> str:
     time = f"{minutes:02}:{seconds:02}.{milliseconds:03}"
 
     return time
+
+
+def format_timedelta_column(values: pd.Series) -> pd.Series:
+    """
+    Format a column of timedeltas to MM:SS.SSS strings with vectorized
+    operations, matching format_timedelta for each value. Missing values stay
+    missing.
+
+    Args:
+        values (pd.Series): A series of timedelta values.
+
+    Returns:
+        pd.Series: The formatted times as strings.
+    """
+    missing = values.isna().to_numpy()
+    milliseconds = np.where(missing, 0,
+                            values.to_numpy(dtype='timedelta64[ns]')
+                            .astype('int64')) // 10**6
+    total_seconds, milliseconds = np.divmod(milliseconds, 1000)
+    minutes, seconds = np.divmod(total_seconds, 60)
+
+    if len(minutes) and minutes.max() >= 100:
+        def padded(numbers: np.ndarray, width: int) -> pd.Series:
+            return (pd.Series(numbers, index=values.index)
+                    .astype(str).str.zfill(width))
+
+        formatted = (padded(minutes, 2) + ':' + padded(seconds, 2) + '.'
+                     + padded(milliseconds, 3))
+    else:
+        # Write the ASCII digits of each fixed width MM:SS.SSS string into
+        # a byte matrix, one row per value.
+        characters = np.empty((len(minutes), 9), dtype=np.uint8)
+        digits = [minutes // 10, minutes % 10, None,
+                  seconds // 10, seconds % 10, None,
+                  milliseconds // 100, milliseconds // 10 % 10,
+                  milliseconds % 10]
+        for position, digit in enumerate(digits):
+            characters[:, position] = (ord('0') + digit if digit is not None
+                                       else ord(':.'[position // 5]))
+        formatted = pd.Series(characters.view('S9').ravel().astype(str),
+                              index=values.index, dtype=object)
+
+    return formatted.mask(missing)
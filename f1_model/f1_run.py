@@ -3,6 +3,9 @@
 import pandas as pd
 import f1_functions
 import quality_control as dq
+import stream_input
+import data_profile
+import output_writer
 import os
 from dotenv import load_dotenv
 import logging
@@ -10,21 +13,43 @@ from datetime import datetime, timedelta
 import time
 
 
-def main(custom_input_path: str = None) -> pd.DataFrame:
+def main(custom_input_path: str = None,
+         profile_inputs: bool = False,
+         leaderboard_format: str = None) -> pd.DataFrame:
     """
     Executes the F1 driver statistics model. Returns an output of the top 3
     drivers in ascending order for average lap times, includes the drivers'
-    fastest lap time. Writes the output to a CSV.
+    fastest lap time. Writes the output to a CSV, and optionally the full
+    ranked leaderboard, atomically through a background writer. The writes
+    are waited for before returning, and are discarded if the run fails.
+    The optional input profile is written while the inputs are validated
+    and is kept when the run fails.
 
     Args:
         custom_input_path (string): An optional parameter to run a specific CSV
-                                    instead of the default inputs
+                                    instead of the default inputs. gzip and
+                                    zstd compressed CSVs are decompressed
+                                    as a stream while they are parsed.
+
+        profile_inputs (bool): Whether to write a JSON profile of the inputs
+                               next to the output CSV.
+
+        leaderboard_format (string): An optional output format, one of 'csv',
+                                     'parquet' or 'jsonl', to also write every
+                                     driver ranked by average lap time with
+                                     their lap counts.
 
     Returns:
         pd.Dataframe: A dataframe with the top 3 drivers sorted by average lap
                       time.
 
     """
+    if (leaderboard_format
+            and leaderboard_format not in output_writer.FORMAT_EXTENSIONS):
+        raise ValueError(f"Unsupported leaderboard format "
+                         f"{leaderboard_format!r}, expected one of "
+                         f"{list(output_writer.FORMAT_EXTENSIONS)}")
+
     # Setup parameters
     current_directory = os.path.dirname(os.path.realpath(__file__))
     env_path = os.path.join(current_directory, "..", "bin", ".env")
@@ -37,6 +62,7 @@ def main(custom_input_path: str = None) -> pd.DataFrame:
     logfile = (f"{log_directory}/f1_drivers_"
                f"{datetime.today().strftime('%Y%m%d_%H%M%S')}.log")
     output_path = f"{home}/data/top_3_drivers.csv"
+    profile_path = f"{os.path.splitext(output_path)[0]}_profile.json"
     column_to_transform = 'time'
     columns_to_format = ['average_lap_time', 'fastest_lap_time']
 
@@ -51,32 +77,59 @@ def main(custom_input_path: str = None) -> pd.DataFrame:
     logging.info("Starting F1 drivers analysis execution")
     logging.info(f"Reading input CSV {input_path}")
 
-    inputs = pd.read_csv(input_path)
+    with stream_input.open_input(input_path) as (input_source, compression):
+        if compression:
+            logging.info(f"Decompressing {compression} input while parsing")
+        inputs = pd.read_csv(input_source)
+
+    with output_writer.BackgroundWriter() as writer:
+        logging.info("Transforming Inputs...")
+        lap_times = f1_functions.parse_lap_times(inputs[column_to_transform])
+
+        if profile_inputs:
+            logging.info(f"Profiling Inputs to JSON: {profile_path}")
+            profile = data_profile.ProfileAccumulator(column_to_transform)
+            writer.submit_task(data_profile.write_profile,
+                               profile.update(inputs, lap_times),
+                               profile_path)
+
+        transformed_inputs = f1_functions.time_conversion(inputs,
+                                                          column_to_transform,
+                                                          lap_times)
+
+        logging.info("Validating Inputs...")
+        dq.main(transformed_inputs, 'DriverInputSchema')
+
+        logging.info("Calculating average lap time per driver...")
+        avg_time_df = f1_functions.average_time_per_driver(transformed_inputs)
 
-    logging.info("Transforming Inputs...")
-    transformed_inputs = f1_functions.time_conversion(inputs,
-                                                      column_to_transform)
+        logging.info("Calculating best lap time per driver...")
+        best_lap_time_df = f1_functions.best_lap_per_driver(transformed_inputs)
 
-    logging.info("Validating Inputs...")
-    dq.main(transformed_inputs, 'DriverInputSchema')
+        f1_assets = pd.merge(avg_time_df, best_lap_time_df, on='driver')
 
-    logging.info("Calculating average lap time per driver...")
-    avg_time_df = f1_functions.average_time_per_driver(transformed_inputs)
+        if leaderboard_format:
+            logging.info("Ranking all drivers by average time...")
+            leaderboard_path = (
+                f"{home}/data/leaderboard"
+                f"{output_writer.FORMAT_EXTENSIONS[leaderboard_format]}")
+            laps_df = f1_functions.laps_per_driver(transformed_inputs)
+            leaderboard = f1_functions.rank_drivers_by_average_time(
+                pd.merge(f1_assets, laps_df, on='driver'))
 
-    logging.info("Calculating best lap time per driver...")
-    best_lap_time_df = f1_functions.best_lap_per_driver(transformed_inputs)
+            logging.info(f"Exporting leaderboard to {leaderboard_path}")
+            writer.submit(leaderboard, leaderboard_path)
 
-    logging.info("Extracting top 3 drivers by average time")
-    f1_assets = pd.merge(avg_time_df, best_lap_time_df, on='driver')
-    top_3_drivers = f1_functions.top_3_drivers_by_average_time(f1_assets)
+        logging.info("Extracting top 3 drivers by average time")
+        top_3_drivers = f1_functions.top_3_drivers_by_average_time(f1_assets)
 
-    logging.info(f"Exporting top 3 drivers data to CSV: {output_path}")
+        logging.info(f"Exporting top 3 drivers data to CSV: {output_path}")
 
-    for column in columns_to_format:
-        top_3_drivers[column] = (
-            top_3_drivers[column].apply(f1_functions.format_timedelta))
+        for column in columns_to_format:
+            top_3_drivers[column] = (
+                top_3_drivers[column].apply(f1_functions.format_timedelta))
 
-    top_3_drivers.to_csv(output_path, index=False)
+        writer.submit(top_3_drivers.copy(), output_path)
 
     logging.info("Run completed in: "
                  f"{timedelta(seconds=int(time.time() - start))}")
@@ -0,0 +1,283 @@
+import os
+import stat
+import logging
+import threading
+import uuid
+import pandas as pd
+from contextlib import contextmanager
+from typing import Callable, Iterator
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+import f1_functions
+
+FORMAT_EXTENSIONS = {
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'jsonl': '.jsonl'
+}
+BATCH_SIZE = 100000
+
+
+def _pyarrow_modules():
+    """
+    Import pyarrow on first use so that CSV and JSON Lines outputs do not
+    depend on it.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError("Writing Parquet outputs requires the 'pyarrow' "
+                          "package") from error
+    return pyarrow, pyarrow.parquet
+
+
+def output_format(path: str) -> str:
+    """
+    Infer the output format from a file extension.
+
+    Args:
+        path (str): Path of the output file.
+
+    Returns:
+        str: One of 'csv', 'parquet' or 'jsonl'.
+
+    Raises:
+        ValueError: If the extension does not match a supported format.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    for file_format, format_extension in FORMAT_EXTENSIONS.items():
+        if extension == format_extension:
+            return file_format
+    raise ValueError(f"Unsupported output format for {path}, expected one "
+                     f"of {list(FORMAT_EXTENSIONS.values())}")
+
+
+def _format_text_batch(batch: pd.DataFrame) -> pd.DataFrame:
+    """
+    Format timedelta columns as MM:SS.SSS strings for text outputs.
+    """
+    batch = batch.copy()
+    for column in batch.columns:
+        if pd.api.types.is_timedelta64_dtype(batch[column]):
+            batch[column] = f1_functions.format_timedelta_column(
+                batch[column])
+    return batch
+
+
+def _batches(data: pd.DataFrame, batch_size: int):
+    for start in range(0, max(len(data), 1), batch_size):
+        yield start, data.iloc[start:start + batch_size]
+
+
+def _write_csv(data: pd.DataFrame, path: str, batch_size: int) -> None:
+    with open(path, 'w', newline='') as handle:
+        for start, batch in _batches(data, batch_size):
+            _format_text_batch(batch).to_csv(handle,
+                                             index=False,
+                                             header=start == 0)
+
+
+def _write_jsonl(data: pd.DataFrame, path: str, batch_size: int) -> None:
+    with open(path, 'w') as handle:
+        for _, batch in _batches(data, batch_size):
+            if len(batch):
+                handle.write(_format_text_batch(batch)
+                             .to_json(orient='records', lines=True))
+
+
+def _write_parquet(data: pd.DataFrame, path: str, batch_size: int) -> None:
+    pyarrow, parquet = _pyarrow_modules()
+    writer = None
+    try:
+        for _, batch in _batches(data, batch_size):
+            schema = writer.schema if writer else None
+            table = pyarrow.Table.from_pandas(batch,
+                                              schema=schema,
+                                              preserve_index=False)
+            if writer is None:
+                writer = parquet.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+WRITERS = {
+    'csv': _write_csv,
+    'parquet': _write_parquet,
+    'jsonl': _write_jsonl
+}
+
+
+@contextmanager
+def atomic_output(output_path: str,
+                  cancelled: threading.Event = None) -> Iterator[str]:
+    """
+    Provide a temporary path in the output directory which is renamed over
+    the output path once the block completes, so readers never see a
+    partially written file. The temporary file is removed if the block
+    fails or the write is cancelled. The output keeps the mode of the file
+    it replaces, or gets the umask default for new files, as a plain open
+    would.
+
+    Args:
+        output_path (str): Path of the output file.
+
+        cancelled (threading.Event): Optional event which, when set before
+                                     the write starts or before the rename,
+                                     discards the write and leaves the
+                                     existing output in place.
+
+    Yields:
+        str: The temporary path to write to.
+    """
+    if cancelled is not None and cancelled.is_set():
+        raise CancelledError(f"Write to {output_path} was cancelled")
+
+    directory, filename = os.path.split(os.path.abspath(output_path))
+    temp_path = os.path.join(directory,
+                             f".{filename}.{uuid.uuid4().hex}.tmp")
+    # Creating the file with 0o666 lets the kernel apply the umask, which
+    # cannot be read without changing it for every thread.
+    os.close(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+
+    try:
+        yield temp_path
+        if cancelled is not None and cancelled.is_set():
+            raise CancelledError(f"Write to {output_path} was cancelled")
+        if os.path.exists(output_path):
+            os.chmod(temp_path, stat.S_IMODE(os.stat(output_path).st_mode))
+        os.replace(temp_path, output_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def write_atomic(data: pd.DataFrame,
+                 output_path: str,
+                 batch_size: int = BATCH_SIZE,
+                 cancelled: threading.Event = None) -> str:
+    """
+    Write a dataframe to CSV, Parquet or JSON Lines in batches, atomically
+    replacing the output path. Timedelta columns are written as MM:SS.SSS
+    strings in text formats and as durations in Parquet.
+
+    Args:
+        data (pd.DataFrame): The dataframe to write.
+
+        output_path (str): Path of the output file. The format is inferred
+                           from its extension.
+
+        batch_size (int): Number of rows written per batch.
+
+        cancelled (threading.Event): Optional event which, when set before
+                                     the write starts or before the rename,
+                                     discards the write.
+
+    Returns:
+        str: The output path.
+    """
+    writer = WRITERS[output_format(output_path)]
+    with atomic_output(output_path, cancelled) as temp_path:
+        writer(data, temp_path, batch_size)
+
+    return output_path
+
+
+class BackgroundWriter:
+    """
+    Writes dataframes on a background thread so that the caller can carry on
+    computing while outputs are written. Writes run one at a time in the
+    order they were submitted, and each one is atomic.
+
+    Methods:
+        submit(data, output_path, batch_size): Queues a dataframe to be
+                                               written.
+
+        submit_task(write, *args): Queues a write function which is not
+                                   cancelled on error.
+
+        close(): Waits for queued writes and raises the first write error.
+
+    When used as a context manager and the with block raises, dataframe
+    writes that have not completed are cancelled and leave any existing
+    outputs in place, since they would come from a failed run. Other tasks
+    still run. Write errors are logged instead of raised, so the original
+    error propagates.
+    """
+    def __init__(self) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._futures = []
+        self._cancelled = threading.Event()
+
+    def submit(self,
+               data: pd.DataFrame,
+               output_path: str,
+               batch_size: int = BATCH_SIZE) -> Future:
+        """
+        Queue a dataframe to be written with write_atomic. The dataframe must
+        not be modified until the write has completed.
+
+        Args:
+            data (pd.DataFrame): The dataframe to write.
+
+            output_path (str): Path of the output file.
+
+            batch_size (int): Number of rows written per batch.
+
+        Returns:
+            Future: A future resolving to the output path.
+        """
+        output_format(output_path)
+        future = self._executor.submit(write_atomic, data, output_path,
+                                       batch_size, self._cancelled)
+        self._futures.append(future)
+        return future
+
+    def submit_task(self, write: Callable, *args) -> Future:
+        """
+        Queue a write function to be called with the given arguments. Unlike
+        submit, the task is not cancelled when the with block raises, for
+        outputs such as the input profile that are wanted from failed runs
+        too.
+
+        Args:
+            write (Callable): The function performing the write.
+
+            *args: Arguments passed to the function.
+
+        Returns:
+            Future: A future resolving to the function's return value.
+        """
+        future = self._executor.submit(write, *args)
+        self._futures.append(future)
+        return future
+
+    def close(self) -> None:
+        """
+        Wait for all queued writes to finish.
+
+        Raises:
+            Exception: The first error raised by a queued write.
+        """
+        self._executor.shutdown(wait=True)
+        for future in self._futures:
+            future.result()
+
+    def __enter__(self) -> 'BackgroundWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+            return
+
+        # Discard outputs of the failed run and let the error raised in the
+        # with block propagate, logging write errors rather than raising
+        # them over it.
+        self._cancelled.set()
+        self._executor.shutdown(wait=True)
+        for future in self._futures:
+            error = future.exception()
+            if error is not None and not isinstance(error, CancelledError):
+                logging.error(f"Background write failed: {error!r}")
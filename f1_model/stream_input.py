@@ -0,0 +1,327 @@
+import gzip
+import io
+import os
+import queue
+import struct
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import (BinaryIO, Callable, Iterator, List, Optional, Tuple,
+                    Union)
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+ZSTD_SKIPPABLE_MAGIC = 0x184D2A5E
+ZSTD_SEEKABLE_MAGIC = 0x8F92EAB1
+ZSTD_SEEKABLE_FOOTER_SIZE = 9
+CHUNK_SIZE = 1024 * 1024
+QUEUE_DEPTH = 8
+
+
+def detect_compression(path: str) -> Optional[str]:
+    """
+    Detect the compression format of a file from its magic bytes.
+
+    Args:
+        path (str): Path of the file to inspect.
+
+    Returns:
+        Optional[str]: 'gzip' or 'zstd' for compressed files, None for plain
+                       files.
+    """
+    with open(path, 'rb') as handle:
+        magic = handle.read(4)
+
+    if magic.startswith(GZIP_MAGIC):
+        return 'gzip'
+    if magic == ZSTD_MAGIC:
+        return 'zstd'
+    return None
+
+
+def gzip_member_index(path: str) -> Optional[List[Tuple[int, int]]]:
+    """
+    Build an index of gzip members from the BGZF 'BC' extra subfield, which
+    records each member's compressed size in its header. This allows members
+    to be located without decompressing the file.
+
+    Args:
+        path (str): Path of the gzip file.
+
+    Returns:
+        Optional[List[Tuple[int, int]]]: A list of (offset, length) pairs, one
+                                         per member, or None if any member does
+                                         not carry a block size.
+    """
+    index = []
+    file_size = os.path.getsize(path)
+
+    with open(path, 'rb') as handle:
+        offset = 0
+        while offset < file_size:
+            handle.seek(offset)
+            header = handle.read(12)
+            if (len(header) < 12 or not header.startswith(GZIP_MAGIC)
+                    or not header[3] & 0x04):
+                return None
+
+            extra_length = struct.unpack('<H', header[10:12])[0]
+            extra = handle.read(extra_length)
+            block_size = None
+            position = 0
+            while position + 4 <= len(extra):
+                subfield_id = extra[position:position + 2]
+                subfield_length = struct.unpack(
+                    '<H', extra[position + 2:position + 4])[0]
+                if subfield_id == b'BC' and subfield_length == 2:
+                    block_size = struct.unpack(
+                        '<H', extra[position + 4:position + 6])[0] + 1
+                    break
+                position += 4 + subfield_length
+
+            if block_size is None:
+                return None
+
+            index.append((offset, block_size))
+            offset += block_size
+
+    return index
+
+
+def zstd_frame_index(path: str) -> Optional[List[Tuple[int, int]]]:
+    """
+    Build an index of zstd frames from the seek table of a file written in the
+    zstd seekable format.
+
+    Args:
+        path (str): Path of the zstd file.
+
+    Returns:
+        Optional[List[Tuple[int, int]]]: A list of (offset, length) pairs, one
+                                         per frame, or None if the file has no
+                                         seek table.
+    """
+    file_size = os.path.getsize(path)
+    if file_size < ZSTD_SEEKABLE_FOOTER_SIZE + 8:
+        return None
+
+    with open(path, 'rb') as handle:
+        handle.seek(file_size - ZSTD_SEEKABLE_FOOTER_SIZE)
+        frame_count, descriptor, magic = struct.unpack(
+            '<IBI', handle.read(ZSTD_SEEKABLE_FOOTER_SIZE))
+        if magic != ZSTD_SEEKABLE_MAGIC:
+            return None
+
+        entry_size = 12 if descriptor & 0x80 else 8
+        table_size = frame_count * entry_size + ZSTD_SEEKABLE_FOOTER_SIZE
+        table_start = file_size - table_size - 8
+        if table_start < 0:
+            return None
+
+        handle.seek(table_start)
+        skippable_magic, frame_size = struct.unpack('<II', handle.read(8))
+        if (skippable_magic != ZSTD_SKIPPABLE_MAGIC
+                or frame_size != table_size):
+            return None
+
+        entries = handle.read(frame_count * entry_size)
+
+    index = []
+    offset = 0
+    for position in range(0, len(entries), entry_size):
+        compressed_size = struct.unpack(
+            '<I', entries[position:position + 4])[0]
+        index.append((offset, compressed_size))
+        offset += compressed_size
+
+    return index
+
+
+def _zstd_module():
+    """
+    Import the zstandard package on first use so that gzip and plain inputs do
+    not depend on it.
+    """
+    try:
+        import zstandard
+    except ImportError as error:
+        raise ImportError("Reading zstd inputs requires the 'zstandard' "
+                          "package") from error
+    return zstandard
+
+
+def _decompress_gzip_member(data: bytes) -> bytes:
+    return zlib.decompress(data, 16 + zlib.MAX_WBITS)
+
+
+def _decompress_zstd_frame(data: bytes) -> bytes:
+    zstandard = _zstd_module()
+    with zstandard.ZstdDecompressor().stream_reader(data) as reader:
+        return reader.read()
+
+
+def _parallel_blocks(path: str,
+                     index: List[Tuple[int, int]],
+                     decompress: Callable[[bytes], bytes],
+                     workers: int) -> Iterator[bytes]:
+    """
+    Decompress independently indexed blocks on a thread pool, yielding the
+    results in file order. At most twice as many blocks as workers are in
+    flight at once to bound memory use.
+    """
+    executor = ThreadPoolExecutor(max_workers=workers)
+    pending = deque()
+    try:
+        with open(path, 'rb') as handle:
+            for offset, length in index:
+                handle.seek(offset)
+                pending.append(executor.submit(decompress,
+                                               handle.read(length)))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _sequential_blocks(path: str, compression: str) -> Iterator[bytes]:
+    """
+    Decompress a single-stream file in fixed size chunks.
+    """
+    with open(path, 'rb') as handle:
+        if compression == 'gzip':
+            reader = gzip.GzipFile(fileobj=handle)
+        else:
+            reader = (_zstd_module().ZstdDecompressor()
+                      .stream_reader(handle, read_across_frames=True))
+        with reader:
+            while True:
+                block = reader.read(CHUNK_SIZE)
+                if not block:
+                    break
+                yield block
+
+
+class DecompressionStream(io.RawIOBase):
+    """
+    Read-only binary stream fed by a background decompression thread.
+
+    Decompressed blocks are handed over through a bounded queue so that
+    decompression overlaps with whatever consumes the stream, e.g. CSV
+    parsing. Errors raised while decompressing are re-raised on read.
+
+    Args:
+        blocks (Iterator[bytes]): An iterator of decompressed blocks. It is
+                                  consumed on the background thread.
+    """
+    _END = object()
+
+    def __init__(self, blocks: Iterator[bytes]) -> None:
+        super().__init__()
+        self._queue = queue.Queue(maxsize=QUEUE_DEPTH)
+        self._stop = threading.Event()
+        self._buffer = memoryview(b'')
+        self._finished = False
+        self._thread = threading.Thread(target=self._produce,
+                                        args=(blocks,),
+                                        daemon=True)
+        self._thread.start()
+
+    def _put(self, item: object) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self, blocks: Iterator[bytes]) -> None:
+        try:
+            for block in blocks:
+                if block and not self._put(block):
+                    return
+            self._put(self._END)
+        except BaseException as error:
+            self._put(error)
+        finally:
+            close = getattr(blocks, 'close', None)
+            if close is not None:
+                close()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._buffer and not self._finished:
+            item = self._queue.get()
+            if item is self._END:
+                self._finished = True
+            elif isinstance(item, BaseException):
+                self._finished = True
+                raise item
+            else:
+                self._buffer = memoryview(item)
+
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+        super().close()
+
+
+@contextmanager
+def open_input(path: str,
+               workers: Optional[int] = None
+               ) -> Iterator[Tuple[Union[str, BinaryIO], Optional[str]]]:
+    """
+    Prepare an input for pd.read_csv, decompressing gzip and zstd files as a
+    stream. Multi-member gzip files carrying BGZF block sizes and zstd files
+    in the seekable format have their blocks decompressed in parallel; other
+    gzip and zstd files are decompressed on a single background thread.
+    Any other input, including plain, bz2, xz or zip files and URLs, is
+    returned as the path unchanged so that pandas reads it as before.
+
+    Args:
+        path (str): Path of the input file.
+
+        workers (Optional[int]): Number of decompression threads to use for
+                                 indexed archives. Defaults to the CPU count.
+
+    Yields:
+        Tuple[Union[str, BinaryIO], Optional[str]]: The source to read, either
+                                                    a binary stream of the
+                                                    decompressed bytes or the
+                                                    path, and the detected
+                                                    compression, 'gzip',
+                                                    'zstd' or None.
+    """
+    compression = detect_compression(path) if os.path.isfile(path) else None
+    if compression is None:
+        yield path, None
+        return
+
+    workers = workers or os.cpu_count() or 1
+    if compression == 'gzip':
+        index = gzip_member_index(path)
+        decompress = _decompress_gzip_member
+    else:
+        index = zstd_frame_index(path)
+        decompress = _decompress_zstd_frame
+
+    if index and len(index) > 1 and workers > 1:
+        blocks = _parallel_blocks(path, index, decompress, workers)
+    else:
+        blocks = _sequential_blocks(path, compression)
+
+    with io.BufferedReader(DecompressionStream(blocks),
+                           buffer_size=CHUNK_SIZE) as stream:
+        yield stream, compression
@@ -4,6 +4,9 @@ import f1_functions
 import f1_run
 import tempfile
 import os
+import gzip
+import struct
+import zlib
 
 
 @pytest.fixture(scope="module")
@@ -145,3 +148,94 @@ def invalid_inputs() -> pd.DataFrame:
     invalid_inputs = pd.DataFrame(data)
 
     return invalid_inputs
+
+
+def bgzf_member(data: bytes) -> bytes:
+    """
+    Compress data into a single gzip member carrying a BGZF 'BC' block size.
+
+    Args:
+        data (bytes): The data to compress.
+
+    Returns:
+        bytes: The compressed gzip member.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+    deflated = compressor.compress(data) + compressor.flush()
+    block_size = 12 + 6 + len(deflated) + 8
+    header = (b'\x1f\x8b\x08\x04' + b'\x00' * 4 + b'\x00\xff'
+              + struct.pack('<H', 6) + b'BC'
+              + struct.pack('<HH', 2, block_size - 1))
+    trailer = struct.pack('<II', zlib.crc32(data), len(data) & 0xffffffff)
+
+    return header + deflated + trailer
+
+
+@pytest.fixture(scope="module")
+def lap_csv() -> bytes:
+    """
+    Fixture to create the contents of an F1 race data CSV.
+
+    Returns:
+        bytes: CSV encoded F1 race data.
+    """
+    drivers = ['Zaid Khalid', 'Mick Schumacher', 'Lewis Hamilton',
+               'Lando Norris']
+    rows = [f"{drivers[lap % 4]},{1 + lap % 3}:{lap % 60:02}.{lap % 1000:03}"
+            for lap in range(5000)]
+
+    return ("driver,time\n" + "\n".join(rows) + "\n").encode()
+
+
+@pytest.fixture(scope="module")
+def gzip_input_path(lap_csv: bytes, tmp_path_factory) -> str:
+    """
+    Fixture to write the F1 race data CSV as a single-member gzip file.
+
+    Returns:
+        str: Path of the gzip file.
+    """
+    path = tmp_path_factory.mktemp("inputs") / "laps.csv.gz"
+    path.write_bytes(gzip.compress(lap_csv))
+
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def bgzf_input_path(lap_csv: bytes, tmp_path_factory) -> str:
+    """
+    Fixture to write the F1 race data CSV as a multi-member BGZF file.
+
+    Returns:
+        str: Path of the BGZF file.
+    """
+    path = tmp_path_factory.mktemp("inputs") / "laps.csv.bgz"
+    members = [bgzf_member(lap_csv[i:i + 4096])
+               for i in range(0, len(lap_csv), 4096)]
+    path.write_bytes(b''.join(members) + bgzf_member(b''))
+
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def zstd_input_path(lap_csv: bytes, tmp_path_factory) -> str:
+    """
+    Fixture to write the F1 race data CSV as a seekable zstd file.
+
+    Returns:
+        str: Path of the zstd file.
+    """
+    zstandard = pytest.importorskip("zstandard")
+    compressor = zstandard.ZstdCompressor()
+    frames = [compressor.compress(lap_csv[i:i + 4096])
+              for i in range(0, len(lap_csv), 4096)]
+    entries = b''.join(struct.pack('<II', len(frame), 4096)
+                       for frame in frames)
+    footer = struct.pack('<IBI', len(frames), 0, 0x8F92EAB1)
+    seek_table = (struct.pack('<II', 0x184D2A5E, len(entries) + len(footer))
+                  + entries + footer)
+
+    path = tmp_path_factory.mktemp("inputs") / "laps.csv.zst"
+    path.write_bytes(b''.join(frames) + seek_table)
+
+    return str(path)
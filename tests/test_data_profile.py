@@ -0,0 +1,132 @@
+import json
+import os
+import pytest
+import pandas as pd
+import data_profile
+import f1_run
+
+
+def test_profile_raw_inputs(missing_inputs: pd.DataFrame) -> None:
+    """
+    Test that blanks and unparseable lap times are profiled from raw inputs.
+
+    Args:
+        missing_inputs (pd.DataFrame): DataFrame containing F1 race data with
+                                       missing values.
+    """
+    profile = data_profile.ProfileAccumulator().update(missing_inputs)
+    results = profile.to_dict()
+
+    assert results['rows'] == 3
+    assert results['columns']['driver']['blanks'] == 1
+    assert results['columns']['time']['blanks'] == 1
+    assert results['columns']['time']['invalid'] == 0
+    assert results['rows_per_driver'] == {'': 1, 'Zaid Khalid': 2}
+    assert results['lap_times']['count'] == 2
+
+
+def test_profile_lap_times(raw_inputs: pd.DataFrame) -> None:
+    """
+    Test the lap time statistics of raw inputs.
+
+    Args:
+        raw_inputs (pd.DataFrame): DataFrame containing raw F1 race data.
+    """
+    results = (data_profile.ProfileAccumulator()
+               .update(raw_inputs)
+               .to_dict())
+
+    assert results['duplicate_rows'] == 0
+    assert results['lap_times']['min'] == '01:00.001'
+    assert results['lap_times']['max'] == '03:00.003'
+    assert results['lap_times']['mean'] == '02:00.002'
+    assert sum(results['lap_times']['histogram'].values()) == 3
+
+
+def test_profile_merge(lap_csv: bytes, tmp_path) -> None:
+    """
+    Test that merging chunk profiles matches profiling in a single pass.
+
+    Args:
+        lap_csv (bytes): The uncompressed CSV contents.
+
+        tmp_path (pathlib.Path): Temporary directory for the CSV input.
+    """
+    path = tmp_path / "laps.csv"
+    path.write_bytes(lap_csv + lap_csv.split(b'\n', 1)[1])
+
+    single = data_profile.ProfileAccumulator().update(pd.read_csv(path))
+    merged = data_profile.ProfileAccumulator()
+    for chunk in pd.read_csv(path, chunksize=777):
+        merged.merge(data_profile.ProfileAccumulator().update(chunk))
+
+    assert merged.to_dict() == single.to_dict()
+    assert single.to_dict()['duplicate_rows'] > 0
+
+
+def test_f1_run_profile(lap_csv: bytes, tmp_path) -> None:
+    """
+    Test that f1_run writes a JSON profile next to the output CSV.
+
+    Args:
+        lap_csv (bytes): The uncompressed CSV contents.
+
+        tmp_path (pathlib.Path): Temporary directory for the CSV input.
+    """
+    path = tmp_path / "laps.csv"
+    path.write_bytes(lap_csv)
+    f1_run.main(str(path), profile_inputs=True)
+
+    profile_path = f"{os.getenv('F1HOME')}/data/top_3_drivers_profile.json"
+    with open(profile_path) as handle:
+        results = json.load(handle)
+    os.remove(profile_path)
+
+    assert results['rows'] == 5000
+    assert results['lap_times']['count'] == 5000
+
+
+def test_f1_run_profile_invalid_inputs(tmp_path) -> None:
+    """
+    Test that f1_run writes the profile before failing on unparseable and
+    blank lap times, and that the profile reports them.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory for the CSV input.
+    """
+    path = tmp_path / "laps.csv"
+    path.write_text("driver,time\n"
+                    "Zaid Khalid,1:00.001\n"
+                    "Zaid Khalid,DNF\n"
+                    "Lando Norris,  \n"
+                    "Lando Norris,1:45.001\n")
+
+    with pytest.raises(ValueError):
+        f1_run.main(str(path), profile_inputs=True)
+
+    profile_path = f"{os.getenv('F1HOME')}/data/top_3_drivers_profile.json"
+    with open(profile_path) as handle:
+        results = json.load(handle)
+    os.remove(profile_path)
+
+    assert results['rows'] == 4
+    assert results['columns']['time']['invalid'] == 1
+    assert results['columns']['time']['blanks'] == 1
+    assert results['lap_times']['count'] == 2
+
+
+def test_write_profile(raw_inputs: pd.DataFrame, tmp_path) -> None:
+    """
+    Test that the profile JSON is written without leaving temporary files.
+
+    Args:
+        raw_inputs (pd.DataFrame): DataFrame containing raw F1 race data.
+
+        tmp_path (pathlib.Path): Temporary directory for the output.
+    """
+    path = tmp_path / "profile.json"
+    profile = data_profile.ProfileAccumulator().update(raw_inputs)
+    data_profile.write_profile(profile, str(path))
+
+    assert json.loads(path.read_text()) == profile.to_dict()
+    assert os.listdir(tmp_path) == ["profile.json"]
@@ -120,3 +120,97 @@ def test_format_timedelta(item: pd.Timedelta,
     """
     result = f1_functions.format_timedelta(item)
     assert result == expected
+
+
+def test_laps_per_driver(transformed_inputs: pd.DataFrame) -> None:
+    """
+    Test the laps_per_driver function to ensure it correctly counts the laps
+    per driver.
+
+    Args:
+        transformed_inputs (pd.DataFrame): DataFrame containing transformed F1
+                                           race data.
+    """
+    results = f1_functions.laps_per_driver(transformed_inputs)
+    assert results['driver'][0] == 'Zaid Khalid'
+    assert results['laps'][0] == 3
+
+
+@pytest.mark.parametrize("item, expected", [
+    ('rank', [1, 2, 3, 4]),
+    ('driver', ['Zaid Khalid', 'Michael Schumacher', 'Lewis Hamilton',
+                'Lando Norris'])
+    ])
+def test_rank_drivers_by_average_time(top_3_inputs: pd.DataFrame,
+                                      item: str,
+                                      expected: list) -> None:
+    """
+    Test the rank_drivers_by_average_time function to ensure it ranks every
+    driver by average lap time.
+
+    Args:
+        top_3_inputs (pd.DataFrame): DataFrame containing F1 race data for the
+                                     top drivers.
+
+        item (str): Column name to check.
+
+        expected (list): Expected list of values for the specified column.
+    """
+    results = f1_functions.rank_drivers_by_average_time(
+        top_3_inputs.sample(frac=1, random_state=0))
+    assert list(results[item]) == expected
+
+
+def test_time_conversion_invalid(invalid_inputs: pd.DataFrame) -> None:
+    """
+    Test the time_conversion function to ensure it raises on lap times that
+    cannot be parsed.
+
+    Args:
+        invalid_inputs (pd.DataFrame): DataFrame containing F1 race data with
+                                       some invalid time values.
+    """
+    with pytest.raises(ValueError):
+        f1_functions.time_conversion(invalid_inputs.copy(), 'time')
+
+
+def test_time_conversion_parsed_lap_times(raw_inputs: pd.DataFrame) -> None:
+    """
+    Test the time_conversion function to ensure it uses lap times parsed
+    by parse_lap_times.
+
+    Args:
+        raw_inputs (pd.DataFrame): DataFrame containing raw F1 race data.
+    """
+    lap_times = f1_functions.parse_lap_times(raw_inputs['time'])
+    results = f1_functions.time_conversion(raw_inputs.copy(), 'time',
+                                           lap_times)
+    assert results['time'][2] == pd.to_timedelta('00:03:00.003')
+
+
+@pytest.mark.parametrize("values", [
+    [pd.to_timedelta('00:01:00.001'), pd.to_timedelta('00:02:05.999')],
+    [pd.to_timedelta('00:00:00'), pd.to_timedelta('01:42:03.004')]
+    ])
+def test_format_timedelta_column(values: list) -> None:
+    """
+    Test the format_timedelta_column function to ensure it formats each value
+    as format_timedelta does.
+
+    Args:
+        values (list): Timedelta values to format.
+    """
+    results = f1_functions.format_timedelta_column(pd.Series(values))
+    assert list(results) == [f1_functions.format_timedelta(value)
+                             for value in values]
+
+
+def test_format_timedelta_column_missing() -> None:
+    """
+    Test the format_timedelta_column function to ensure missing values stay
+    missing.
+    """
+    results = f1_functions.format_timedelta_column(
+        pd.Series([pd.to_timedelta('00:01:00.001'), pd.NaT]))
+    assert results[0] == '01:00.001'
+    assert pd.isna(results[1])
@@ -0,0 +1,269 @@
+import json
+import os
+import stat
+import threading
+import pytest
+from concurrent.futures import CancelledError
+import pandas as pd
+import output_writer
+import f1_run
+
+
+@pytest.mark.parametrize("filename, batch_size", [
+    ('leaderboard.csv', 100000),
+    ('leaderboard.csv', 3),
+    ('leaderboard.jsonl', 100000),
+    ('leaderboard.jsonl', 3)
+])
+def test_write_text_formats(top_3_inputs: pd.DataFrame,
+                            tmp_path,
+                            filename: str,
+                            batch_size: int) -> None:
+    """
+    Test that text outputs are written in batches with formatted lap times.
+
+    Args:
+        top_3_inputs (pd.DataFrame): DataFrame containing F1 race data for the
+                                     top drivers.
+
+        tmp_path (pathlib.Path): Temporary directory for the output.
+
+        filename (str): Name of the output file.
+
+        batch_size (int): Number of rows written per batch.
+    """
+    path = str(tmp_path / filename)
+    output_writer.write_atomic(top_3_inputs, path, batch_size=batch_size)
+
+    if filename.endswith('.csv'):
+        results = pd.read_csv(path)
+    else:
+        results = pd.read_json(path, lines=True, dtype=False)
+
+    assert list(results['driver']) == list(top_3_inputs['driver'])
+    assert results['average_lap_time'][3] == '02:45.002'
+    assert os.listdir(tmp_path) == [filename]
+
+
+def test_write_parquet(top_3_inputs: pd.DataFrame, tmp_path) -> None:
+    """
+    Test that Parquet outputs keep lap times as durations.
+
+    Args:
+        top_3_inputs (pd.DataFrame): DataFrame containing F1 race data for the
+                                     top drivers.
+
+        tmp_path (pathlib.Path): Temporary directory for the output.
+    """
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / "leaderboard.parquet")
+    output_writer.write_atomic(top_3_inputs, path, batch_size=3)
+
+    results = pd.read_parquet(path)
+    assert list(results['driver']) == list(top_3_inputs['driver'])
+    assert (results['fastest_lap_time'][3]
+            == pd.to_timedelta('00:01:45.002'))
+
+
+def test_write_atomic_failure(tmp_path, monkeypatch) -> None:
+    """
+    Test that a failed write keeps the existing output and removes the
+    temporary file.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory for the output.
+
+        monkeypatch (pytest.MonkeyPatch): Used to inject a failing writer.
+    """
+    def partial_write(data: pd.DataFrame, path: str, batch_size: int) -> None:
+        with open(path, 'w') as handle:
+            handle.write("partial")
+        raise OSError("disk full")
+
+    monkeypatch.setitem(output_writer.WRITERS, 'jsonl', partial_write)
+    path = tmp_path / "leaderboard.jsonl"
+    path.write_text("previous\n")
+
+    with pytest.raises(OSError):
+        output_writer.write_atomic(pd.DataFrame({'driver': ['Zaid Khalid']}),
+                                   str(path))
+
+    assert path.read_text() == "previous\n"
+    assert os.listdir(tmp_path) == ["leaderboard.jsonl"]
+
+
+def test_unsupported_format(top_3_inputs: pd.DataFrame) -> None:
+    """
+    Test that unsupported output extensions are rejected.
+
+    Args:
+        top_3_inputs (pd.DataFrame): DataFrame containing F1 race data for the
+                                     top drivers.
+    """
+    with pytest.raises(ValueError):
+        with output_writer.BackgroundWriter() as writer:
+            writer.submit(top_3_inputs, 'leaderboard.xml')
+
+
+def test_background_writer(top_3_inputs: pd.DataFrame, tmp_path) -> None:
+    """
+    Test that queued writes have completed once the writer is closed.
+
+    Args:
+        top_3_inputs (pd.DataFrame): DataFrame containing F1 race data for the
+                                     top drivers.
+
+        tmp_path (pathlib.Path): Temporary directory for the outputs.
+    """
+    paths = [str(tmp_path / f"leaderboard_{i}.csv") for i in range(3)]
+    with output_writer.BackgroundWriter() as writer:
+        futures = [writer.submit(top_3_inputs, path) for path in paths]
+
+    assert [future.result() for future in futures] == paths
+    assert all(len(pd.read_csv(path)) == 4 for path in paths)
+
+
+def test_f1_run_leaderboard(lap_csv: bytes, tmp_path) -> None:
+    """
+    Test that f1_run writes the full ranked leaderboard.
+
+    Args:
+        lap_csv (bytes): The uncompressed CSV contents.
+
+        tmp_path (pathlib.Path): Temporary directory for the CSV input.
+    """
+    path = tmp_path / "laps.csv"
+    path.write_bytes(lap_csv)
+    top_3_drivers = f1_run.main(str(path), leaderboard_format='jsonl')
+
+    leaderboard_path = f"{os.getenv('F1HOME')}/data/leaderboard.jsonl"
+    with open(leaderboard_path) as handle:
+        results = [json.loads(line) for line in handle]
+    os.remove(leaderboard_path)
+
+    assert [row['rank'] for row in results] == [1, 2, 3, 4]
+    assert sum(row['laps'] for row in results) == 5000
+    assert ([row['driver'] for row in results[:3]]
+            == list(top_3_drivers['driver']))
+
+
+def test_write_atomic_permissions(top_3_inputs: pd.DataFrame,
+                                  tmp_path) -> None:
+    """
+    Test that new outputs get the umask default mode and replaced outputs
+    keep their existing mode.
+
+    Args:
+        top_3_inputs (pd.DataFrame): DataFrame containing F1 race data for the
+                                     top drivers.
+
+        tmp_path (pathlib.Path): Temporary directory for the outputs.
+    """
+    umask = os.umask(0o022)
+    try:
+        new_path = tmp_path / "leaderboard.csv"
+        output_writer.write_atomic(top_3_inputs, str(new_path))
+
+        existing_path = tmp_path / "leaderboard.jsonl"
+        existing_path.write_text("previous\n")
+        existing_path.chmod(0o640)
+        output_writer.write_atomic(top_3_inputs, str(existing_path))
+    finally:
+        os.umask(umask)
+
+    assert stat.S_IMODE(new_path.stat().st_mode) == 0o644
+    assert stat.S_IMODE(existing_path.stat().st_mode) == 0o640
+
+
+def test_f1_run_unsupported_leaderboard_format(tmp_path) -> None:
+    """
+    Test that f1_run rejects an unsupported leaderboard format before reading
+    the inputs.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory for the missing input.
+    """
+    with pytest.raises(ValueError):
+        f1_run.main(str(tmp_path / "missing.csv"),
+                    leaderboard_format='parquet2')
+
+
+def test_background_writer_body_error(top_3_inputs: pd.DataFrame,
+                                      tmp_path,
+                                      monkeypatch) -> None:
+    """
+    Test that an error raised in the with block is not replaced by a failed
+    queued write.
+
+    Args:
+        top_3_inputs (pd.DataFrame): DataFrame containing F1 race data for the
+                                     top drivers.
+
+        tmp_path (pathlib.Path): Temporary directory for the output.
+
+        monkeypatch (pytest.MonkeyPatch): Used to inject a failing writer.
+    """
+    def failing_write(data: pd.DataFrame, path: str, batch_size: int) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setitem(output_writer.WRITERS, 'csv', failing_write)
+
+    with pytest.raises(KeyError):
+        with output_writer.BackgroundWriter() as writer:
+            writer.submit(top_3_inputs, str(tmp_path / 'leaderboard.csv'))
+            raise KeyError('driver')
+
+
+def test_background_writer_discards_on_error(top_3_inputs: pd.DataFrame,
+                                             tmp_path,
+                                             monkeypatch) -> None:
+    """
+    Test that a write in progress when the with block raises leaves the
+    existing output in place.
+
+    Args:
+        top_3_inputs (pd.DataFrame): DataFrame containing F1 race data for the
+                                     top drivers.
+
+        tmp_path (pathlib.Path): Temporary directory for the outputs.
+
+        monkeypatch (pytest.MonkeyPatch): Used to inject a slow writer.
+    """
+    write_csv = output_writer.WRITERS['csv']
+    released = threading.Event()
+    threading.Timer(0.2, released.set).start()
+
+    def slow_write(data: pd.DataFrame, path: str, batch_size: int) -> None:
+        released.wait()
+        write_csv(data, path, batch_size)
+
+    monkeypatch.setitem(output_writer.WRITERS, 'csv', slow_write)
+    path = tmp_path / "leaderboard.csv"
+    path.write_text("previous\n")
+
+    with pytest.raises(KeyError):
+        with output_writer.BackgroundWriter() as writer:
+            future = writer.submit(top_3_inputs, str(path))
+            raise KeyError('driver')
+
+    assert path.read_text() == "previous\n"
+    assert os.listdir(tmp_path) == ["leaderboard.csv"]
+    assert isinstance(future.exception(), CancelledError)
+
+
+def test_background_writer_task_kept_on_error(tmp_path) -> None:
+    """
+    Test that tasks queued with submit_task still run when the with block
+    raises.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory for the output.
+    """
+    path = tmp_path / "profile.json"
+
+    with pytest.raises(KeyError):
+        with output_writer.BackgroundWriter() as writer:
+            writer.submit_task(path.write_text, "{}")
+            raise KeyError('driver')
+
+    assert path.read_text() == "{}"
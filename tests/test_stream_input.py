@@ -0,0 +1,185 @@
+import bz2
+import zlib
+import pytest
+import pandas as pd
+import stream_input
+import f1_run
+
+
+def test_detect_plain_input(lap_csv: bytes, tmp_path) -> None:
+    """
+    Test that a plain CSV is not reported as compressed.
+
+    Args:
+        lap_csv (bytes): The uncompressed CSV contents.
+
+        tmp_path (pathlib.Path): Temporary directory for the plain input.
+    """
+    path = tmp_path / "laps.csv"
+    path.write_bytes(lap_csv)
+    assert stream_input.detect_compression(str(path)) is None
+
+
+@pytest.mark.parametrize("fixture_name, compression", [
+    ('gzip_input_path', 'gzip'),
+    ('bgzf_input_path', 'gzip'),
+    ('zstd_input_path', 'zstd')
+])
+def test_detect_compression(request: pytest.FixtureRequest,
+                            fixture_name: str,
+                            compression: str) -> None:
+    """
+    Test that compressed inputs are detected from their magic bytes.
+
+    Args:
+        request (pytest.FixtureRequest): Used to look up the input fixture.
+
+        fixture_name (str): Name of the fixture providing the input path.
+
+        compression (str): Expected compression format.
+    """
+    path = request.getfixturevalue(fixture_name)
+    assert stream_input.detect_compression(path) == compression
+
+
+def test_gzip_member_index(bgzf_input_path: str,
+                           gzip_input_path: str) -> None:
+    """
+    Test that BGZF members are indexed and plain gzip files are not.
+
+    Args:
+        bgzf_input_path (str): Path of a multi-member BGZF file.
+
+        gzip_input_path (str): Path of a single-member gzip file.
+    """
+    assert len(stream_input.gzip_member_index(bgzf_input_path)) > 2
+    assert stream_input.gzip_member_index(gzip_input_path) is None
+
+
+def test_zstd_frame_index(zstd_input_path: str) -> None:
+    """
+    Test that the frames of a seekable zstd file are indexed.
+
+    Args:
+        zstd_input_path (str): Path of a seekable zstd file.
+    """
+    assert len(stream_input.zstd_frame_index(zstd_input_path)) > 2
+
+
+@pytest.mark.parametrize("fixture_name, workers", [
+    ('gzip_input_path', None),
+    ('bgzf_input_path', 1),
+    ('bgzf_input_path', 4),
+    ('zstd_input_path', 1),
+    ('zstd_input_path', 4)
+])
+def test_open_input(request: pytest.FixtureRequest,
+                    lap_csv: bytes,
+                    fixture_name: str,
+                    workers: int) -> None:
+    """
+    Test that compressed inputs stream back the original bytes, both
+    sequentially and with parallel decompression.
+
+    Args:
+        request (pytest.FixtureRequest): Used to look up the input fixture.
+
+        lap_csv (bytes): The uncompressed CSV contents.
+
+        fixture_name (str): Name of the fixture providing the input path.
+
+        workers (int): Number of decompression threads.
+    """
+    path = request.getfixturevalue(fixture_name)
+    with stream_input.open_input(path, workers=workers) as (stream, _):
+        assert stream.read() == lap_csv
+
+
+def test_open_input_corrupt(tmp_path) -> None:
+    """
+    Test that decompression errors are raised to the reader.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory for the corrupt input.
+    """
+    path = tmp_path / "corrupt.csv.gz"
+    path.write_bytes(b'\x1f\x8b\x08\x00' + b'\x00' * 64)
+    with pytest.raises(zlib.error):
+        with stream_input.open_input(str(path)) as (stream, _):
+            stream.read()
+
+
+def test_open_input_truncated(gzip_input_path: str, tmp_path) -> None:
+    """
+    Test that a truncated gzip input raises an EOFError to the reader.
+
+    Args:
+        gzip_input_path (str): Path of a single-member gzip file.
+
+        tmp_path (pathlib.Path): Temporary directory for the truncated input.
+    """
+    with open(gzip_input_path, 'rb') as handle:
+        data = handle.read()
+    path = tmp_path / "truncated.csv.gz"
+    path.write_bytes(data[:len(data) // 2])
+
+    with pytest.raises(EOFError):
+        with stream_input.open_input(str(path)) as (stream, _):
+            stream.read()
+
+
+def test_open_input_corrupt_parallel(bgzf_input_path: str, tmp_path) -> None:
+    """
+    Test that an error decompressing a BGZF member on the thread pool is
+    raised to the reader.
+
+    Args:
+        bgzf_input_path (str): Path of a multi-member BGZF file.
+
+        tmp_path (pathlib.Path): Temporary directory for the corrupt input.
+    """
+    with open(bgzf_input_path, 'rb') as handle:
+        data = bytearray(handle.read())
+    offset, length = stream_input.gzip_member_index(bgzf_input_path)[1]
+    data[offset + 18:offset + length - 8] = b'\xff' * (length - 26)
+    path = tmp_path / "corrupt.csv.bgz"
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(zlib.error):
+        with stream_input.open_input(str(path), workers=4) as (stream, _):
+            stream.read()
+
+
+def test_f1_run_compressed(bgzf_input_path: str,
+                           gzip_input_path: str) -> None:
+    """
+    Test that f1_run produces the same output for compressed inputs.
+
+    Args:
+        bgzf_input_path (str): Path of a multi-member BGZF file.
+
+        gzip_input_path (str): Path of a single-member gzip file.
+    """
+    pd.testing.assert_frame_equal(f1_run.main(bgzf_input_path),
+                                  f1_run.main(gzip_input_path))
+
+
+def test_open_input_passes_through_other_formats(lap_csv: bytes,
+                                                 tmp_path) -> None:
+    """
+    Test that inputs which are not gzip or zstd are handed to pandas as a
+    path, so it still picks a decompressor from the extension.
+
+    Args:
+        lap_csv (bytes): The uncompressed CSV contents.
+
+        tmp_path (pathlib.Path): Temporary directory for the bz2 input.
+    """
+    path = str(tmp_path / "laps.csv.bz2")
+    with open(path, 'wb') as handle:
+        handle.write(bz2.compress(lap_csv))
+
+    with stream_input.open_input(path) as (source, compression):
+        assert source == path
+        assert compression is None
+        assert len(pd.read_csv(source)) == 5000